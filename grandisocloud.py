@@ -7,6 +7,7 @@ This is a single worker node that can be run against a local or cloud queue.
 
 from fire import Fire
 from functools import partial
+import time
 from taskqueue import queueable, TaskQueue
 
 import networkx as nx
@@ -26,11 +27,69 @@ MOTIF.add_edge("2", "3")
 MOTIF.add_edge("3", "1")
 
 interestingness = uniform_node_interestingness(MOTIF)
+MOTIF_N = MOTIF.number_of_nodes()
+
+# The number of candidates a worker expands locally, per leased task, before
+# handing the rest of its frontier back to the queue.
+MAX_LOCAL_EXPANSIONS = 32
+
+# Local expansion also stops after this many seconds, whatever is left of the
+# budget above. This keeps a task well inside taskqueue's default 300-second
+# lease, so that SQS does not redeliver (and re-expand) a task that is still
+# running. Workers run with a shorter lease_seconds should lower this too.
+MAX_LOCAL_EXPANSION_SECONDS = 60
+
+# Queue handles and host graphs are reused across tasks in the same worker
+# process. Building a TaskQueue against SQS creates a boto3 client and resolves
+# the queue URL with a GetQueueUrl round-trip, and opening a grand.Graph sets
+# up a fresh SQL engine and connection pool; we only want to pay for each once.
+_QUEUE_CACHE = {}
+_HOST_CACHE = {}
+
+
+def _get_queue(queue_uri: str) -> TaskQueue:
+    """
+    Get a (cached) TaskQueue for the given queue URI.
+
+    Arguments:
+        queue_uri (str): The URI of the queue to use. See ptq for more details.
+
+    Returns:
+        TaskQueue: The queue handle for this URI
+
+    """
+    if queue_uri not in _QUEUE_CACHE:
+        _QUEUE_CACHE[queue_uri] = TaskQueue(queue_uri)
+    return _QUEUE_CACHE[queue_uri]
+
+
+def _get_host(host_grand_uri: str) -> nx.DiGraph:
+    """
+    Get a (cached) NetworkX view of the Grand host graph at the given URI.
+
+    Arguments:
+        host_grand_uri (str): The URI of the host graph to use (see grand docs
+            for more details).
+
+    Returns:
+        nx.DiGraph: A NetworkX-compatible view of the host graph
+
+    """
+    if host_grand_uri not in _HOST_CACHE:
+        _HOST_CACHE[host_grand_uri] = grand.Graph(
+            backend=SQLBackend(db_url=host_grand_uri, directed=True),
+            directed=True,
+        ).nx
+    return _HOST_CACHE[host_grand_uri]
 
 
 @queueable
 def get_next_backbone_candidates_and_enqueue(
-    job_id: str, queue_uri: str, candidate: dict, host_grand_uri: str
+    job_id: str,
+    queue_uri: str,
+    candidate: dict,
+    host_grand_uri: str,
+    max_local_expansions: int = MAX_LOCAL_EXPANSIONS,
 ) -> None:
     """
     Perform a single iteration of the algorithm.
@@ -38,6 +97,14 @@ def get_next_backbone_candidates_and_enqueue(
     Retrieves a job from the queue, expands upon it using GrandIso, and then
     enqueues the resulting candidates.
 
+    Rather than enqueueing every child, the worker keeps expanding the subtree
+    under `candidate` depth-first on a local stack, up to a total of
+    `max_local_expansions` expansions or `MAX_LOCAL_EXPANSION_SECONDS` seconds,
+    whichever comes first. Whatever is left on the stack then goes to the
+    shared queue, where idle workers can pick it up. This saves a queue
+    round-trip for most of the small subtrees, while the large subtrees of a
+    skewed host graph still spread across workers.
+
     Arguments:
         job_id (str): The job ID of the job to expand upon.
         queue_uri (str): The URI of the queue to use. See ptq for more details.
@@ -46,37 +113,61 @@ def get_next_backbone_candidates_and_enqueue(
             pass an empty dict.
         host_grand_uri (str): The URI of the host graph to use (see grand docs
             for more details).
+        max_local_expansions (int): The number of candidates to expand in this
+            task before handing the remaining ones back to the queue. Set to 1
+            to enqueue every child without expanding it locally. Must be at
+            least 1; smaller values raise a ValueError. The task must finish
+            within the worker's lease, so a larger budget may need a longer
+            `run --lease_seconds`.
 
     Returns:
         None
 
     """
-    host = grand.Graph(
-        backend=SQLBackend(db_url=host_grand_uri, directed=True),
-        directed=True,
-    ).nx
-    q = TaskQueue(queue_uri)
-
-    # get the next backbone candidates
-    next_candidates = get_next_backbone_candidates(
-        candidate, MOTIF, host, interestingness=interestingness, directed=False
-    )
-    for c in next_candidates:
-        if len(c.keys()) == len(MOTIF.nodes()):
-            # TODO: Handle complete records
-            pass
-        else:
-            q.insert(
-                [
-                    partial(
-                        get_next_backbone_candidates_and_enqueue,
-                        job_id,
-                        queue_uri,
-                        c,
-                        host_grand_uri,
-                    )
-                ]
-            )
+    if max_local_expansions < 1:
+        # With no budget, the candidate would be re-enqueued unexpanded forever.
+        raise ValueError(
+            f"max_local_expansions must be at least 1, got {max_local_expansions}."
+        )
+
+    host = _get_host(host_grand_uri)
+    q = _get_queue(queue_uri)
+
+    # Expand depth-first on a local stack until the expansion budget or the
+    # time budget is spent. The leased candidate itself is always expanded.
+    stack = [candidate]
+    expansions = 0
+    deadline = time.monotonic() + MAX_LOCAL_EXPANSION_SECONDS
+    while stack and expansions < max_local_expansions:
+        if expansions and time.monotonic() >= deadline:
+            break
+        next_candidates = get_next_backbone_candidates(
+            stack.pop(), MOTIF, host, interestingness=interestingness, directed=False
+        )
+        expansions += 1
+        for c in next_candidates:
+            if len(c) == MOTIF_N:
+                # TODO: Handle complete records
+                pass
+            else:
+                stack.append(c)
+
+    # Hand the rest of the frontier back to the queue in a single insert, so
+    # that taskqueue can send it in SendMessageBatch groups (10 per request on
+    # SQS) rather than one SendMessage round-trip per candidate:
+    if stack:
+        q.insert(
+            [
+                partial(
+                    get_next_backbone_candidates_and_enqueue,
+                    job_id,
+                    queue_uri,
+                    c,
+                    host_grand_uri,
+                )
+                for c in stack
+            ]
+        )
 
 
 def initialize(job_id: str, queue_uri: str, host_grand_uri: str) -> None:
@@ -93,7 +184,10 @@ def initialize(job_id: str, queue_uri: str, host_grand_uri: str) -> None:
         None
 
     """
-    get_next_backbone_candidates_and_enqueue(job_id, queue_uri, {}, host_grand_uri)
+    # Only expand the empty seed here; the search itself is left to workers.
+    get_next_backbone_candidates_and_enqueue(
+        job_id, queue_uri, {}, host_grand_uri, max_local_expansions=1
+    )
 
 
 def run(
@@ -118,14 +212,16 @@ def run(
         queue_uri (str): The URI of the queue to use. See ptq for more details.
         verbose (bool): Whether to print progress information.
         lease_seconds (int): The number of seconds to wait for a job before
-            timing out.
+            timing out. Each task expands candidates locally for up to
+            MAX_LOCAL_EXPANSION_SECONDS (60) seconds, so keep this well above
+            that; a larger local expansion budget needs a longer lease.
         tally (bool): Whether to keep a tally of the number of jobs processed.
 
     Returns:
         None
 
     """
-    Q = TaskQueue(queue_uri)
+    Q = _get_queue(queue_uri)
     if lease_seconds:
         Q.poll(
             verbose=verbose,